@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: hassoun
+Batch Game Object Class
+Simulates a large population of plant games at once. The games' state is
+stored in shared memory arrays and partitioned across a persistent pool of
+worker processes which step their slice in place
+"""
+
+from plant import Plant
+from multiprocessing import shared_memory
+from multiprocessing import connection
+import multiprocessing as mp
+import numpy as np
+import time
+import weakref
+
+# rows of the shared state array, one column per game
+FIELDS = ('size', 'available_water', 'available_light', 'available_nutrients',
+          'delta_n_water', 'delta_n_light', 'delta_n_nutrients',
+          'add_water', 'add_light', 'add_nutrients', 'status')
+
+_ROW = {field: i for i, field in enumerate(FIELDS)}
+
+# commands sent to the workers (and their acknowledgement) through pipes
+_STEP = b's'
+_STOP = b'q'
+_DONE = b'd'
+
+
+def plant_parameters(plant):
+    """ Extracts the parameters of a plant used when stepping a batch of games
+    :param plant: Plant object used as a template for every game of the batch
+    Returns a dictionary of floats
+    """
+    return {
+            'water_c_rate': float(plant.water_c_rate),
+            'light_c_rate': float(plant.light_c_rate),
+            'nutrients_c_rate': float(plant.nutrients_c_rate),
+            'water_g_rate': float(plant.water_g_rate),
+            'light_g_rate': float(plant.light_g_rate),
+            'nutrients_g_rate': float(plant.nutrients_g_rate),
+            'water_coef': float(plant.growth_coef['water']),
+            'light_coef': float(plant.growth_coef['light']),
+            'nutrients_coef': float(plant.growth_coef['nutrients']),
+            'water_range': tuple(plant.water_range),
+            'light_range': tuple(plant.light_range),
+            'nutrients_range': tuple(plant.nutrients_range)}
+
+
+def step_games(state, params, max_plant_size):
+    """ Steps a slice of games by a single time period, in place.
+    It mirrors Game.update: the period's additions are made available, the
+    plants consume and grow, then their health and the game's goal are checked.
+    Games that are already over (status != 0) are left untouched
+    :param state: 2D array (len(FIELDS), n_games) holding the games' state
+    :param params: dictionary of plant parameters (see plant_parameters)
+    :param max_plant_size: plant's size to achieve to win a game (in inches)
+    """
+    status = state[_ROW['status']]
+    active = status == 0
+    if active.all():
+        # every game goes on, the state's rows are updated in place
+        active = None
+    elif not active.any():
+        return
+
+    size = state[_ROW['size']]
+    n_games = size.shape[0]
+    growth = np.zeros(n_games)
+    needed = np.empty(n_games)
+    consumed = np.empty(n_games)
+    bound = np.empty(n_games)
+    dead = np.zeros(n_games, dtype=bool)
+    flag = np.empty(n_games, dtype=bool)
+    if active is not None:
+        # games that are over are computed too but never written back
+        available = np.empty(n_games)
+        delta = np.empty(n_games)
+
+    for resource in ('water', 'light', 'nutrients'):
+        available_row = state[_ROW['available_' + resource]]
+        delta_row = state[_ROW['delta_n_' + resource]]
+        if active is None:
+            available, delta = available_row, delta_row
+
+        # player's additions (or removals) for the period, never below 0
+        np.add(available_row, state[_ROW['add_' + resource]], out=available)
+        np.maximum(available, 0, out=available)
+
+        # consumption and differential vs the plant's need
+        np.multiply(size, params[resource + '_c_rate'], out=needed)
+        np.minimum(available, needed, out=consumed)
+        np.subtract(available, needed, out=delta)
+
+        # health boundaries
+        low, high = params[resource + '_range']
+        np.multiply(needed, low, out=bound)
+        dead |= np.less(delta, bound, out=flag)
+        np.multiply(needed, high, out=bound)
+        dead |= np.greater(delta, bound, out=flag)
+
+        # update available ressources (water and nutrients only)
+        if resource != 'light':
+            np.subtract(available, consumed, out=available)
+            np.maximum(available, 0, out=available)
+
+        np.multiply(consumed, params[resource + '_coef'], out=consumed)
+        np.multiply(consumed, params[resource + '_g_rate'], out=consumed)
+        growth += consumed
+
+        if active is not None:
+            np.copyto(available_row, available, where=active)
+            np.copyto(delta_row, delta, where=active)
+
+    # -1: plant is dead, 1: goal achieved, 0: game goes on
+    np.add(size, growth, out=growth)
+    np.greater_equal(growth, max_plant_size, out=flag)
+    if active is None:
+        size[:] = growth
+        status[:] = flag
+        status[dead] = -1.
+    else:
+        np.copyto(size, growth, where=active)
+        result = flag.astype(np.float64)
+        result[dead] = -1.
+        np.copyto(status, result, where=active)
+
+
+def _worker(shm_name, n_games, start, stop, params, max_plant_size, conn):
+    """ Worker process loop. Attaches to the shared state once and steps its
+    slice of games every time it is told to, until told to stop or the main
+    process is gone
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        state = np.ndarray((len(FIELDS), n_games), dtype=np.float64, buffer=shm.buf)
+        games = state[:, start:stop]
+        try:
+            while conn.recv_bytes() == _STEP:
+                step_games(games, params, max_plant_size)
+                conn.send_bytes(_DONE)
+        except (EOFError, OSError):
+            pass
+        del state, games
+    finally:
+        shm.close()
+
+
+def _release(shm, processes):
+    """ Terminates the workers still running and releases the shared memory.
+    Called on close or when a batch game is garbage collected without being closed
+    """
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+            process.join(1)
+        if process.is_alive():
+            process.kill()
+        process.join()
+    del processes[:]
+    try:
+        shm.close()
+    except BufferError:
+        # views on the state are still referenced, the segment is released
+        # once they are
+        pass
+    shm.unlink()
+
+
+class BatchGame:
+
+    def __init__(self, n_games, max_time_period, max_plant_size, workers=None,
+                 plant=None, timeout=None):
+        """ This is a batch game constructor. It is called to create a new
+        population of games sharing the same settings and plant parameters
+        :param n_games: integer containing the number of games in the batch
+        :param max_time_period: integer containing the number of "rounds"
+        (time periods) in a game
+        :param max_plant_size: plant's size to achieve before the end of the game
+        :param workers: integer containing the number of worker processes
+        (defaults to the number of cores, 1 steps the games in process)
+        :param plant: Plant object used as a template (defaults to a new Plant)
+        :param timeout: float containing the maximum time (seconds) to wait for
+        the workers to step a time period (defaults to no limit)
+        """
+        self.n_games = int(n_games)
+        self.timeout = timeout
+
+        # current time period of the games
+        self.time_period = 1
+
+        # same defaults as Game
+        self.max_time_period = max_time_period if max_time_period > 0 else 20
+        self.max_plant_size = max_plant_size if max_plant_size > 0 else 10
+
+        if plant is None:
+            plant = Plant()
+        self.params = plant_parameters(plant)
+
+        # games' state, shared with the workers
+        self._shm = shared_memory.SharedMemory(
+                create=True, size=len(FIELDS) * max(self.n_games, 1) * 8)
+        self.state = np.ndarray((len(FIELDS), self.n_games), dtype=np.float64,
+                                buffer=self._shm.buf)
+        self.state[:] = 0
+        self.state[_ROW['size']] = plant.size
+
+        # the segment is unlinked even if the batch game is never closed
+        self._processes = []
+        self._connections = []
+        self._broken = False
+        self._finalizer = weakref.finalize(self, _release, self._shm, self._processes)
+
+        if workers is None:
+            workers = mp.cpu_count()
+        self.workers = max(1, min(int(workers), self.n_games))
+
+        if self.workers > 1:
+            try:
+                self._start_pool()
+            except BaseException:
+                self.close()
+                raise
+
+
+    def _start_pool(self):
+        """ Starts the persistent worker pool. Each worker gets a contiguous
+        slice of the games and a pipe the commands are sent through
+        """
+        ctx = mp.get_context()
+        bounds = np.linspace(0, self.n_games, self.workers + 1).astype(int)
+
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            conn, worker_conn = ctx.Pipe()
+            process = ctx.Process(
+                    target=_worker,
+                    args=(self._shm.name, self.n_games, int(start), int(stop),
+                          self.params, self.max_plant_size, worker_conn),
+                    daemon=True)
+            process.start()
+            worker_conn.close()
+            self._processes.append(process)
+            self._connections.append(conn)
+
+
+    def _barrier(self):
+        """ Releases the workers and waits until every one of them has stepped
+        its slice. A worker exiting (e.g. killed when running out of memory)
+        or the timeout expiring breaks the pool
+        """
+        if self._broken:
+            raise RuntimeError('Batch workers pool is broken, close the batch game')
+
+        try:
+            for conn in self._connections:
+                conn.send_bytes(_STEP)
+        except OSError:
+            pass
+
+        pending = set(self._connections)
+        sentinels = {p.sentinel: p for p in self._processes}
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+
+        while pending:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            ready = connection.wait(list(pending) + list(sentinels), remaining)
+            if not ready:
+                self._broken = True
+                raise RuntimeError('Batch workers did not step the games within %s seconds'%
+                                   self.timeout)
+            for item in ready:
+                if item in pending:
+                    try:
+                        item.recv_bytes()
+                    except (EOFError, OSError):
+                        continue # the worker's sentinel tells why
+                    pending.remove(item)
+                else:
+                    self._broken = True
+                    process = sentinels[item]
+                    process.join()
+                    raise RuntimeError('Batch worker pid %d exited unexpectedly (exit code %s)'%(
+                            process.pid, process.exitcode))
+
+
+    def field(self, name):
+        """ Returns a view on one field of the games' state (see FIELDS)
+        :param name: string containing the name of the field
+        """
+        return self.state[_ROW[name]]
+
+
+    def set_additions(self, water=0, light=0, nutrients=0):
+        """ Sets the quantities the players add (or remove if negative) at the
+        start of the next time period
+        :param water: drops of water, scalar or array of length n_games
+        :param light: units of light, scalar or array of length n_games
+        :param nutrients: pills of nutrients, scalar or array of length n_games
+        """
+        self.state[_ROW['add_water']] = water
+        self.state[_ROW['add_light']] = light
+        self.state[_ROW['add_nutrients']] = nutrients
+
+
+    def step(self):
+        """ Steps every game by a single time period
+        Returns False once the time period limit has been reached
+        """
+        if self.time_period > self.max_time_period:
+            return False
+
+        if self._processes:
+            self._barrier()
+        else:
+            step_games(self.state, self.params, self.max_plant_size)
+
+        self.time_period += 1
+        return True
+
+
+    def run(self, water=0, light=0, nutrients=0):
+        """ Runs the games until the time period limit with constant additions
+        :param water: drops of water added at each time period
+        :param light: units of light added at each time period
+        :param nutrients: pills of nutrients added at each time period
+        Returns the games' status
+        -1: if the plant is dead
+        0: if the plant is alive but the goal was not achieved
+        1: if the plant is alive and the goal is achieved
+        """
+        self.set_additions(water, light, nutrients)
+        while self.step():
+            pass
+        return self.field('status').copy()
+
+
+    def close(self):
+        """ Stops the worker pool and releases the shared memory. Workers
+        that can't be stopped (e.g. the pool is broken) are terminated
+        """
+        if not self._broken:
+            for conn in self._connections:
+                try:
+                    conn.send_bytes(_STOP)
+                except OSError:
+                    pass
+            for process in self._processes:
+                process.join(self.timeout)
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+
+        if self._shm is not None:
+            del self.state
+            self._finalizer()
+            self._shm = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage:
+    bench_batch.py <n_games> [--periods=<n>] [--workers=<list>]
+
+Arguments:
+    <n_games>                Number (integer) of games simulated in the batch
+
+Options:
+    -h --help                Show this screen
+    --periods=<n>            Number of time periods to step [default: 20]
+    --workers=<list>         Comma separated worker counts to benchmark [default: 1,2,4,8]
+
+"""
+
+from batch import BatchGame
+from plant import Plant
+from docopt import docopt
+import multiprocessing as mp
+import platform
+import time
+
+def benchmark(n_games, periods, workers):
+    """ Steps a batch of games and measures the time spent stepping
+    :param n_games: integer containing the number of games in the batch
+    :param periods: integer containing the number of time periods to step
+    :param workers: integer containing the number of worker processes
+    Returns the elapsed time in seconds
+    """
+    # a plant that does not grow keeps the same needs every time period so
+    # that the games stay alive with constant additions
+    plant = Plant()
+    plant.growth_coef = {'water': 0, 'light': 0, 'nutrients': 0}
+
+    with BatchGame(n_games, periods, 10, workers=workers, plant=plant) as batch:
+        # light is not consumed, it only needs to be provided once
+        batch.set_additions(100, 10, 5)
+        start = time.perf_counter()
+        batch.step()
+        batch.set_additions(100, 0, 5)
+        while batch.step():
+            pass
+        elapsed = time.perf_counter() - start
+        assert (batch.field('status') == 0).all()
+        return elapsed
+
+
+def main(args):
+
+    n_games = int(args['<n_games>'])
+    periods = int(args['--periods'])
+    workers = [int(w) for w in args['--workers'].split(',')]
+
+    # markdown table, ready to be pasted in the README
+    print("Stepping %d games over %d time periods on %d core(s), %s"%(
+            n_games, periods, mp.cpu_count(), platform.platform()))
+    if max(workers) > mp.cpu_count():
+        print("Warning: more workers than cores, the extra workers only add overhead")
+    print("")
+    print("| workers | seconds | games.periods/s | speedup |")
+    print("| ------: | ------: | --------------: | ------: |")
+
+    reference = None
+    for w in workers:
+        elapsed = benchmark(n_games, periods, w)
+        if reference is None:
+            reference = elapsed
+        print("| %7d | %7.3f | %15.3e | %6.2fx |"%(
+                w, elapsed, n_games * periods / elapsed, reference / elapsed))
+
+
+if __name__ == "__main__":
+    args = docopt(__doc__)
+    main(args)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage:
+    build_calibration.py [--max-periods=<n>] [--max-size=<n>] [--log-sizes=<n>] [--steps=<n>] [--output=<path>]
+
+Options:
+    -h --help                Show this screen
+    --max-periods=<n>        Largest number of time periods swept [default: 50]
+    --max-size=<n>           Largest plant size (inches) swept inch by inch [default: 500]
+    --log-sizes=<n>          Number of sizes swept geometrically beyond it [default: 200]
+    --steps=<n>              Number of supply fractions simulated [default: 501]
+    --output=<path>          Path of the index written [default: calibration.npz]
+
+Difficulty calibration of the games' settings. The plant is supplied at each
+time period with the same fraction (between the lower health boundary and 1)
+of what it needs. The index stores, for each (max_time_period, max_plant_size),
+the smallest fraction that still reaches the goal. Sizes are swept inch by inch
+up to --max-size, then geometrically up to the largest size any game reaches.
+"""
+
+from game import Game
+from plant import Plant
+from docopt import docopt
+import calibration
+import numpy as np
+
+
+def simulate_supply(fraction, max_time_period):
+    """ Plays a game where the plant gets a fraction of its needs at each time period
+    :param fraction: float containing the fraction of the needs made available
+    :param max_time_period: integer containing the number of time periods played
+    Returns the plant's size at the end of each time period (nan once dead)
+    """
+    g = Game('Calibration', max_time_period, np.inf)
+    plant = g.plant
+    sizes = np.full(max_time_period, np.nan)
+
+    for period in range(max_time_period):
+        g.add_water(max(fraction * plant.get_water_needed() - g.available_water, 0))
+        g.add_light(max(fraction * plant.get_light_needed() - g.available_light, 0))
+        g.add_nutrients(max(fraction * plant.get_nutrients_needed() - g.available_nutrients, 0))
+
+        status, _ = g.update()
+        if status == -1:
+            break
+        sizes[period] = plant.size
+
+    return sizes
+
+
+def build_index(max_periods=50, max_size=500, steps=501, log_sizes=200):
+    """ Sweeps the (max_time_period, max_plant_size) space
+    :param max_periods: integer containing the largest number of time periods
+    :param max_size: integer containing the largest plant size (inches) swept inch by inch
+    :param steps: integer containing the number of supply fractions simulated
+    :param log_sizes: integer containing the number of sizes swept geometrically
+    beyond max_size, up to the largest size reachable
+    Returns a 2D array (max_periods, number of sizes) of the smallest fraction
+    of the plant's needs winning the game, indexed by [periods - 1, size's index]
+    (nan if the game can't be won), the array of sizes swept and an array of
+    the largest plant size reachable for each number of periods
+    """
+    low = -Plant().water_range[0]
+    fractions = np.linspace(1 - low, 1, steps)
+
+    # sizes reached for each fraction, increasing with the fraction
+    sizes = np.array([simulate_supply(f, max_periods) for f in fractions])
+    alive = ~np.isnan(sizes)
+    reachable = np.nanmax(sizes, axis=0)
+
+    targets = np.arange(1., max_size + 1)
+    if log_sizes > 0 and reachable.max() > max_size:
+        targets = np.concatenate(
+                (targets, np.geomspace(max_size, reachable.max(), log_sizes + 1)[1:]))
+
+    index = np.full((max_periods, targets.size), np.nan, dtype=np.float32)
+    for period in range(max_periods):
+        reached = alive[:, period, None] & (sizes[:, period, None] >= targets)
+        won = reached.any(axis=0)
+        index[period, won] = fractions[reached.argmax(axis=0)[won]]
+
+    return index, targets, reachable
+
+
+def main(args):
+
+    index, targets, reachable = build_index(
+            int(args['--max-periods']), int(args['--max-size']), int(args['--steps']),
+            int(args['--log-sizes']))
+    calibration.save_index(index, targets, reachable, args['--output'])
+    print("Calibrated %d x %d games settings, %d can be won"%(
+            index.shape[0], index.shape[1], np.count_nonzero(~np.isnan(index))))
+
+
+if __name__ == "__main__":
+    args = docopt(__doc__)
+    main(args)
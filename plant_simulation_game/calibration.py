@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: hassoun
+Difficulty calibration lookup
+Reads the index of the games' difficulty precomputed by build_calibration.py
+and evaluates a game's settings with it
+"""
+
+from plant import Plant
+import numpy as np
+import os
+
+# default location of the precomputed index
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'calibration.npz')
+
+# games won with at most this fraction of the plant's needs are easy
+EASY_FRACTION = 0.75
+
+# index loaded by load_index, keyed by path
+_indexes = {}
+
+
+def save_index(index, sizes, reachable, path=INDEX_PATH):
+    """ Writes an index built by build_calibration.build_index
+    :param index: 2D array returned by build_index
+    :param sizes: array of the sizes swept returned by build_index
+    :param reachable: array of the largest sizes returned by build_index
+    :param path: string containing the path of the file written
+    """
+    np.savez_compressed(path, fraction=index, size=sizes, reachable=reachable)
+    _indexes.pop(path, None)
+
+
+def load_index(path=INDEX_PATH):
+    """ Loads an index written by save_index, once per process
+    :param path: string containing the path of the index
+    Returns the index, the sizes swept and the largest reachable sizes or None
+    if it has not been computed
+    """
+    if path not in _indexes:
+        if os.path.exists(path):
+            with np.load(path) as data:
+                _indexes[path] = data['fraction'], data['size'], data['reachable']
+        else:
+            _indexes[path] = None
+    return _indexes[path]
+
+
+def query(max_time_period, max_plant_size, path=INDEX_PATH):
+    """ Looks up the difficulty of a game's settings. Sizes in between the
+    index's entries are interpolated; games longer than the index are
+    evaluated as the longest game indexed
+    :param max_time_period: number of time periods in the game
+    :param max_plant_size: plant's size to achieve before the end of the game
+    :param path: string containing the path of the index
+    Returns None if the index is missing, otherwise a dictionary containing
+    difficulty: 'easy', 'hard' or 'impossible'
+    fraction: smallest fraction of the plant's needs to supply (nan if impossible)
+    water, light, nutrients: minimum resources to provide at the first time period
+    """
+    loaded = load_index(path)
+    if loaded is None:
+        return None
+    index, sizes, reachable = loaded
+
+    # the controller plays whole time periods only
+    t = int(min(max(max_time_period, 1), index.shape[0])) - 1
+    size = max(float(max_plant_size), 1.)
+
+    if size > reachable[t]:
+        fraction = np.nan
+    else:
+        # linear interpolation between the surrounding sizes, the plant
+        # needs its full supply beyond the largest size won
+        j = int(np.searchsorted(sizes, size))
+        fraction = float(index[t, j])
+        if np.isnan(fraction):
+            fraction = 1.
+        if j > 0 and size < sizes[j]:
+            lower = float(index[t, j - 1])
+            weight = (size - sizes[j - 1]) / (sizes[j] - sizes[j - 1])
+            fraction = float(lower + weight * (fraction - lower))
+
+    if np.isnan(fraction):
+        return {'difficulty': 'impossible', 'fraction': fraction,
+                'water': None, 'light': None, 'nutrients': None}
+
+    plant = Plant()
+    return {
+            'difficulty': 'easy' if fraction <= EASY_FRACTION else 'hard',
+            'fraction': fraction,
+            'water': int(np.ceil(fraction * plant.get_water_needed())),
+            'light': int(np.ceil(fraction * plant.get_light_needed())),
+            'nutrients': int(np.ceil(fraction * plant.get_nutrients_needed()))}
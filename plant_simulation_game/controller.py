@@ -6,7 +6,7 @@ Controller Object Class that processes the user's input
 Contains all the game's mechanics
 """
 
-import emoji
+from terminal import Terminal, emojize
 
 class Controller:
 
@@ -28,28 +28,23 @@ class Controller:
                 'light': self.game.remove_light,
                 'nutrients': self.game.remove_nutrients}
         
-        # dictionary of units for each of the plant's parameters
-        self.dict_units = {
-                'water': 'drops',
-                'light': 'units',
-                'nutrients': 'pills'}
-        
-        # dictionary of emojis for each of the plant's parameters
-        self.dict_emoji = {
-                'water': ':droplet:',
-                'light': ':sun_with_face:',
-                'nutrients': ':pill:'}
+        # terminal rendering the menus and the game status
+        self.terminal = Terminal(self.game)
+        
+        # display the game status at the end of each round
+        self.game.events.subscribe('round_completed', self.on_round_completed)
+    
+    def on_round_completed(self, time_period, growth, water, light, nutrients):
+        """ Displays the game status once a round (time period) is completed
+        """
+        self.terminal.status(growth, water, light, nutrients)
     
     def run_game(self):
         """ Runs the game. By asking if a user wants to start or quit
         the game
         """
-        print("Please chose between the following options:")
-        print("%s  Start Game: Press 1"%(
-                emoji.emojize(':thumbsup:', use_aliases=True)))
-        print("%s  Quit Game: Press 2"%(
-                emoji.emojize(':thumbsdown:', use_aliases=True)))
-        choice = input("Enter choice:")
+        self.terminal.menu('start')
+        choice = self.terminal.ask()
         
         if choice == '1':
             self.start_game()
@@ -64,6 +59,7 @@ class Controller:
         """
         print("\n")
         print("Starting game...")
+        self.terminal.start_screen()
         self.period_choice()
         
         return 1
@@ -75,7 +71,7 @@ class Controller:
         """
         print("\n")
         print("Quitting game...")
-        print("Thank you for playing the %s  %s game!"%(emoji.emojize(':seedling:'), self.game.game_name))
+        print("Thank you for playing the %s  %s game!"%(emojize(':seedling:'), self.game.game_name))
         return 1
     
     
@@ -83,21 +79,11 @@ class Controller:
         """ Prompts the user with choices of actions to perform for the current
         time period
         """
-        print("\n")
-        print("==============================================================")
-        print("What would you like to perform for the time period #%d"%self.game.time_period)   
-        print("Please chose between the following options:")
-        print("--> View Game Status %s : Press 1"%emoji.emojize(':seedling:'))
-        print("--> Manage Water %s : Press 2"%emoji.emojize(':droplet:'))
-        print("--> Manage Light %s : Press 3"%emoji.emojize(':sun_with_face:'))
-        print("--> Manage Nutrients %s : Press 4"%emoji.emojize(':pill:'))
-        print("--> Nothing. Continue to the next round! %s : Press 5"%emoji.emojize(':round_pushpin:'))
-        print("--> Quit Game %s : Press 6"%emoji.emojize(':thumbsdown:', use_aliases=True))
-        print("==============================================================")   
-        choice = input("Enter choice:")
+        self.terminal.menu('period')
+        choice = self.terminal.ask()
         
         if choice == '1':
-            self.game.view_game_status()
+            self.terminal.status()
             self.period_choice()
             
         elif choice == '2':
@@ -140,46 +126,36 @@ class Controller:
             else:
                 print("\n")
                 print("Seems like you've reached the time period limit of the game! %s"%
-                      emoji.emojize(':hear_no_evil:', use_aliases=True))        
-                print("GAME OVER! %s  Try again..."%emoji.emojize(':skull:', use_aliases=True))
+                      emojize(':hear_no_evil:'))        
+                print("GAME OVER! %s  Try again..."%emojize(':skull:'))
                 print("Thank you for playing the %s  %s game!"%(
-                        emoji.emojize(':seedling:'), self.game.game_name))
+                        emojize(':seedling:'), self.game.game_name))
                 return 1
         
         elif game_status == 1:
             print("\n")
-            print("CONGRATULATIONS! %s"%emoji.emojize(':clap:', use_aliases=True))
+            print("CONGRATULATIONS! %s"%emojize(':clap:'))
             print("PLANT IS ALIVE %s  and has reached the %.2f inches goal!"%(
-                    emoji.emojize(':green_heart:', use_aliases=True), self.game.max_plant_size))
+                    emojize(':green_heart:'), self.game.max_plant_size))
             print("Thank you for playing the %s  %s game!"%(
-                    emoji.emojize(':seedling:'), self.game.game_name))
+                    emojize(':seedling:'), self.game.game_name))
             return 1
             
         else:
             print("\n")
-            print("GAME OVER! %s  Try again..."%emoji.emojize(':skull:', use_aliases=True))
-            print("PLANT DIED %s  because of: %s"%(emoji.emojize(
-                    ':broken_heart:', use_aliases=True), reason))
+            print("GAME OVER! %s  Try again..."%emojize(':skull:'))
+            print("PLANT DIED %s  because of: %s"%(emojize(
+                    ':broken_heart:'), reason))
             return 1
         
     
     def manage_parameter(self, parameter):
         
-        print("\n")
-        print("==============================================================")
-        print("You can either add or remove/reduce %s  %s (%s) for the time period #%d"%(
-              emoji.emojize(self.dict_emoji[parameter]),parameter, self.dict_units[parameter],
-              self.game.time_period))   
-        print("Please chose between the following options:")
-        print("--> View Game Status %s : Press 1"%emoji.emojize(':seedling:'))
-        print("--> Add %s %s : Press 2"%(parameter, emoji.emojize(':heavy_plus_sign:')))
-        print("--> Remove/Reduce %s %s : Press 3"%(parameter, emoji.emojize(':heavy_minus_sign:')))
-        print("--> I'm good. Get back to previous menu %s : Press 4"%emoji.emojize(':thumbs_up:'))
-        print("==============================================================")   
-        choice = input("Enter choice:")
+        self.terminal.menu(('manage', parameter))
+        choice = self.terminal.ask()
             
         if choice == '1':
-            self.game.view_game_status()
+            self.terminal.status()
             self.manage_parameter(parameter)
         
         elif choice == '2':
@@ -196,10 +172,8 @@ class Controller:
             
     def add_choice(self, parameter):
         
-        print("\n")
-        print("How much %s  %s %s do you want to add (enter 0 to cancel)?"%(
-                emoji.emojize(self.dict_emoji[parameter]), parameter, self.dict_units[parameter]))
-        choice = input("Enter choice:")
+        self.terminal.menu(('add', parameter))
+        choice = self.terminal.ask()
         
         try:
             integer = int(choice)
@@ -217,10 +191,8 @@ class Controller:
             
     def remove_choice(self, parameter):
         
-        print("\n")
-        print("How many %s  %s %s do you want to remove/reduce (enter 0 to cancel)?"%(
-                emoji.emojize(self.dict_emoji[parameter]), parameter, self.dict_units[parameter]))
-        choice = input("Enter choice:")
+        self.terminal.menu(('remove', parameter))
+        choice = self.terminal.ask()
         
         try:
             integer = int(choice)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: hassoun
+Event Bus Object Class
+Lets integrations (display, logging, telemetry...) observe a game's lifecycle
+without polling it
+"""
+
+import threading
+import traceback
+import queue
+
+# events emitted by a game and the arguments passed to their subscribers
+EVENTS = (
+        'resource_added',     # (resource, value, level)
+        'resource_removed',   # (resource, value, level)
+        'round_completed',    # (time_period, growth, water, light, nutrients)
+        'plant_died',         # (reason)
+        'goal_reached',       # (size)
+        'game_over')          # (status, reason)
+
+
+class EventBus:
+
+    def __init__(self):
+        """ This is an event bus constructor. Every event starts with no
+        subscribers. The subscribers of an event are stored in a tuple
+        attribute named after the event, so emitting an event nobody listens
+        to only costs looking up and iterating over an empty tuple
+        """
+        for event in EVENTS:
+            setattr(self, event, ())
+
+
+    def subscribe(self, event, callback):
+        """ Subscribes a callback to an event
+        :param event: string containing the name of the event (see EVENTS)
+        :param callback: callable called with the event's arguments
+        Returns the callback
+        """
+        if event not in EVENTS:
+            raise ValueError('Unknown event %s'%event)
+        setattr(self, event, getattr(self, event) + (callback,))
+        return callback
+
+
+    def unsubscribe(self, event, callback):
+        """ Unsubscribes a callback from an event
+        :param event: string containing the name of the event (see EVENTS)
+        :param callback: callable previously subscribed to the event
+        """
+        subscribers = list(getattr(self, event))
+        subscribers.remove(callback)
+        setattr(self, event, tuple(subscribers))
+
+
+    def emit(self, event, *args):
+        """ Calls the subscribers of an event
+        :param event: string containing the name of the event (see EVENTS)
+        :param args: event's arguments
+        """
+        for callback in getattr(self, event):
+            callback(*args)
+
+
+class AsyncSubscriber:
+
+    def __init__(self, consumer, max_batch=100, interval=0.1, max_queue=10000):
+        """ This is an asynchronous subscriber constructor. Events are queued
+        when emitted and handed over in batches to the consumer by a background
+        thread, so a slow consumer doesn't hold the game back until the queue
+        is full
+        :param consumer: callable called with a list of (event, args) tuples
+        :param max_batch: integer containing the maximum number of events per batch
+        :param interval: float containing the maximum time (seconds) to wait
+        for more events before handing over a batch
+        :param max_queue: integer containing the maximum number of events
+        queued, emitting an event waits for room once it is reached (0 for no limit)
+        """
+        self.consumer = consumer
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue = queue.Queue(max_queue)
+        # first exception raised by the consumer, re-raised on close
+        self.error = None
+        # (bus, event, callback) subscribed, unsubscribed on close
+        self._subscriptions = []
+        self._closed = object()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+
+    def attach(self, bus, events=EVENTS):
+        """ Subscribes to events of an event bus
+        :param bus: EventBus object
+        :param events: names of the events to subscribe to (defaults to all)
+        """
+        for event in events:
+            callback = bus.subscribe(event, self._handler(event))
+            self._subscriptions.append((bus, event, callback))
+
+
+    def _handler(self, event):
+        """ Returns a callback queuing an event with its arguments
+        """
+        put = self._queue.put
+        return lambda *args: put((event, args))
+
+
+    def _run(self):
+        """ Background thread loop. Waits for an event then gathers the
+        following ones into a batch
+        """
+        while True:
+            item = self._queue.get()
+            if item is self._closed:
+                return
+            batch = [item]
+            closed = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=self.interval)
+                except queue.Empty:
+                    break
+                if item is self._closed:
+                    closed = True
+                    break
+                batch.append(item)
+            try:
+                self.consumer(batch)
+            except Exception as e:
+                # the batch is dropped but the following events are still handed over
+                print("Event consumer failed on a batch of %d events:"%len(batch))
+                traceback.print_exc()
+                if self.error is None:
+                    self.error = e
+            if closed:
+                return
+
+
+    def close(self):
+        """ Hands over the remaining events to the consumer and stops the
+        background thread. Raises the first exception the consumer raised, if any
+        """
+        for bus, event, callback in self._subscriptions:
+            bus.unsubscribe(event, callback)
+        self._subscriptions = []
+        self._queue.put(self._closed)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
@@ -7,8 +7,9 @@ Defines a game, its context and the objects running during the game
 """
 
 from plant import Plant
+from events import EventBus
+import calibration
 import numpy as np
-import emoji
 
 class Game:
     
@@ -53,6 +54,13 @@ class Game:
         # the available nutrients for the plant to use at current time period
         self.available_nutrients = 0
         
+        # difficulty of the game's settings looked up in the precomputed
+        # calibration index (None if unavailable)
+        self.difficulty = calibration.query(self.max_time_period, self.max_plant_size)
+        
+        # event bus notifying subscribers of the game's lifecycle
+        self.events = EventBus()
+        
         
     def set_time_period(self, value):
         """ Updates the game's current time period value (round #)
@@ -82,6 +90,7 @@ class Game:
         :param value: quantity of water (drops) added
         """
         self.available_water += value
+        self.events.emit('resource_added', 'water', value, self.available_water)
         
 
     def add_light(self, value):
@@ -89,6 +98,7 @@ class Game:
         :param value: quantity of light (units) increased
         """
         self.available_light += value
+        self.events.emit('resource_added', 'light', value, self.available_light)
         
         
     def add_nutrients(self, value):
@@ -96,6 +106,7 @@ class Game:
         :param value: quantity of nutrients (pills) added
         """
         self.available_nutrients += value
+        self.events.emit('resource_added', 'nutrients', value, self.available_nutrients)
         
         
     def remove_water(self, value):
@@ -105,6 +116,7 @@ class Game:
         if (self.available_water - value) < 0:
             print("After removal seems like there is no water left!")
         self.available_water = np.max((self.available_water - value, 0))
+        self.events.emit('resource_removed', 'water', value, self.available_water)
     
     
     def remove_light(self, value):
@@ -114,6 +126,7 @@ class Game:
         if (self.available_light - value) < 0:
             print("After removal seems like light has been turned off!")
         self.available_light = np.max((self.available_light - value, 0))
+        self.events.emit('resource_removed', 'light', value, self.available_light)
     
     
     def remove_nutrients(self, value):
@@ -123,11 +136,13 @@ class Game:
         if (self.available_nutrients - value) < 0:
             print("After removal seems like there are no nutrients left!")
         self.available_nutrients = np.max((self.available_nutrients - value, 0))
+        self.events.emit('resource_removed', 'nutrients', value, self.available_nutrients)
     
     
     def update(self):
         """ Updates the game's and plant's parameters
-        This will simulate the plant's consumption and growth
+        This will simulate the plant's consumption and growth and notify the
+        subscribers of the game's events (see events.EVENTS)
         Returns the game status and a reason if any
         -1: if the plant is dead
         0: if the plant is alive but the goal is still not achieved
@@ -148,14 +163,24 @@ class Game:
         # check plant's health
         status, reason = self.plant.get_health(growth)
         
-        # provide game status at end of round
-        self.view_game_status(growth, w, l, n)
+        # notify the end of round (e.g. to display the game status)
+        self.events.emit('round_completed', self.time_period, growth, w, l, n)
         
         # did we achieve the game's goal ?
         # evaluated only if the plant is not dead
         if status == 1:
             status = self.game_goal_achieved()
         
+        if status == -1:
+            self.events.emit('plant_died', reason)
+        elif status == 1:
+            self.events.emit('goal_reached', self.plant.size)
+        
+        if status != 0:
+            self.events.emit('game_over', status, reason)
+        elif self.time_period >= self.max_time_period:
+            self.events.emit('game_over', status, 'time period limit reached')
+        
         return status, reason
     
     
@@ -198,31 +223,6 @@ class Game:
         return growth
         
         
-    def view_game_status(self, growth=0, water_consumed=0, light_consumed=0, nutrients_consumed=0):
-        """ Displays some information regarding the plant and game current status
-        :growth: plant growth in inches
-        :water_consumed: water consumed in drops
-        :light_consumed: units of light used
-        :nutrients_consumed: nutrients consumed in pills
-        """
-        print("\n")
-        print("************************************************")
-        print("Current Plant Size %s : %.3f inches"%(emoji.emojize(':round_pushpin:'), self.plant.size))
-        print("Water level %s : %.3f drops"%(emoji.emojize(':droplet:'), self.available_water))
-        print("Light level %s : %.3f units"%(emoji.emojize(':sun_with_face:'), self.available_light))
-        print("Nutrients level %s : %.3f pills"%(emoji.emojize(':pill:'), self.available_nutrients))
-        print("-----------------------------------------------")
-        print("Plant growth %s : %.3f inches"%(emoji.emojize(':straight_ruler:'), growth))
-        print("Water consumption %s : %.3f drops"%(emoji.emojize(':droplet:'), water_consumed))
-        print("Light used %s : %.3f units"%(emoji.emojize(':sun_with_face:'), light_consumed))
-        print("Nutrients consumption %s : %.3f pills"%(emoji.emojize(':pill:'), nutrients_consumed))
-        print("-----------------------------------------------")
-        print("Plant water consumption vs need %s : %.3f drops"%(emoji.emojize(':droplet:'), self.plant.delta_n_water))
-        print("Plant light provided vs need %s : %.3f units"%(emoji.emojize(':sun_with_face:'), self.plant.delta_n_light))
-        print("Plant nutrients consumption vs need %s : %.3f pills"%(emoji.emojize(':pill:'), self.plant.delta_n_nutrients))
-        print("************************************************")
-    
-    
     def game_goal_achieved(self):
         """ Checks if the game's goal has been achieved>
         That is to say if the plant has reached the maximum heigth
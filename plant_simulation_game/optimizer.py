@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage:
+    optimizer.py <max_time_periods> <max_plant_size> [options]
+
+Arguments:
+    <max_time_periods>       Number (integer) of rounds in the game (# time periods)
+    <max_plant_size>         Plant's size (integer) to reach before the end of the game (in inches)
+
+Options:
+    -h --help                Show this screen
+    --population=<n>         Number of policies per generation [default: 100]
+    --generations=<n>        Number of generations [default: 50]
+    --workers=<n>            Number of worker processes evaluating the policies [default: 1]
+    --checkpoint=<path>      File the progress is saved to and resumed from
+    --every=<n>              Number of generations between checkpoints [default: 5]
+    --seed=<n>               Random seed [default: 0]
+
+Multi-objective search (NSGA-II) of the policies growing a plant: the
+resources spent vs the number of time periods to reach the plant's size.
+A policy tops up each resource at every time period to a fraction of the
+plant's need, the fractions (one per resource) being searched.
+"""
+
+from batch import FIELDS, plant_parameters, step_games
+from plant import Plant
+from docopt import docopt
+import multiprocessing as mp
+import numpy as np
+import json
+import os
+
+RESOURCES = ('water', 'light', 'nutrients')
+
+# bounds of the fractions of the plant's needs searched
+LOWER = 0.5
+UPPER = 1.5
+
+
+def evaluate(fractions, max_time_period, max_plant_size, params, size=1):
+    """ Plays one game per policy, all of them at once
+    :param fractions: 2D array (n_policies, 3) of the fractions of the plant's
+    water/light/nutrients needs made available at each time period
+    :param max_time_period: integer containing the number of time periods
+    :param max_plant_size: plant's size to achieve before the end of the game
+    :param params: dictionary of plant parameters (see batch.plant_parameters)
+    :param size: plant's initial size
+    Returns 3 arrays
+    cost: total quantity of resources added (drops + units + pills)
+    periods: time periods played to reach the plant's size
+    violation: 0 if the plant reached its size, how far it was otherwise
+    """
+    n = len(fractions)
+    row = {field: i for i, field in enumerate(FIELDS)}
+    state = np.zeros((len(FIELDS), n))
+    state[row['size']] = size
+    cost = np.zeros(n)
+    periods = np.full(n, max_time_period + 1.)
+
+    for period in range(1, max_time_period + 1):
+        active = state[row['status']] == 0
+        if not active.any():
+            break
+
+        # players can only add whole drops, units and pills
+        for i, resource in enumerate(RESOURCES):
+            needed = state[row['size']] * params[resource + '_c_rate']
+            add = np.ceil(np.maximum(
+                    fractions[:, i] * needed - state[row['available_' + resource]], 0))
+            add[~active] = 0
+            state[row['add_' + resource]] = add
+            cost += add
+
+        step_games(state, params, max_plant_size)
+        periods[active & (state[row['status']] == 1)] = period
+
+    status = state[row['status']]
+    violation = np.where(status == 1, 0., max_plant_size - state[row['size']])
+    violation[status == -1] += max_plant_size
+    return cost, periods, violation
+
+
+def dominates(a, b):
+    """ Constrained dominance between the objectives of two policies: policies
+    reaching the plant's size come first, then the least violation, then
+    pareto dominance over (cost, periods)
+    :param a: tuple (cost, periods, violation)
+    :param b: tuple (cost, periods, violation)
+    """
+    if a[2] != b[2]:
+        return a[2] < b[2]
+    return a[0] <= b[0] and a[1] <= b[1] and (a[0] < b[0] or a[1] < b[1])
+
+
+def non_dominated_sort(objectives):
+    """ Sorts policies into successive non dominated fronts
+    :param objectives: list of tuples (cost, periods, violation)
+    Returns the rank of each policy (0 for the pareto front)
+    """
+    n = len(objectives)
+    dominated = [[] for _ in range(n)]
+    counts = np.zeros(n, dtype=int)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if dominates(objectives[i], objectives[j]):
+                dominated[i].append(j)
+                counts[j] += 1
+            elif dominates(objectives[j], objectives[i]):
+                dominated[j].append(i)
+                counts[i] += 1
+
+    rank = np.zeros(n, dtype=int)
+    front = [i for i in range(n) if counts[i] == 0]
+    level = 0
+    while front:
+        following = []
+        for i in front:
+            rank[i] = level
+            for j in dominated[i]:
+                counts[j] -= 1
+                if counts[j] == 0:
+                    following.append(j)
+        front = following
+        level += 1
+    return rank
+
+
+def crowding_distance(objectives, rank):
+    """ Computes how isolated each policy is within its front
+    :param objectives: 2D array (n_policies, 2) of (cost, periods)
+    :param rank: array of the policies' rank
+    Returns the crowding distance of each policy
+    """
+    distance = np.zeros(len(objectives))
+    for level in np.unique(rank):
+        members = np.flatnonzero(rank == level)
+        for k in range(objectives.shape[1]):
+            values = objectives[members, k]
+            order = members[np.argsort(values)]
+            distance[order[0]] = distance[order[-1]] = np.inf
+            spread = values.max() - values.min()
+            if spread > 0 and len(order) > 2:
+                distance[order[1:-1]] += (
+                        objectives[order[2:], k] - objectives[order[:-2], k]) / spread
+    return distance
+
+
+class Optimizer:
+
+    def __init__(self, max_time_period, max_plant_size, population=100,
+                 workers=1, seed=0, plant=None):
+        """ This is an optimizer constructor
+        :param max_time_period: integer containing the number of "rounds"
+        (time periods) in a game
+        :param max_plant_size: plant's size to achieve before the end of the game
+        :param population: integer containing the number of policies per generation
+        :param workers: integer containing the number of worker processes
+        :param seed: integer containing the random seed
+        :param plant: Plant object used as a template (defaults to a new Plant)
+        """
+        self.max_time_period = max_time_period
+        self.max_plant_size = max_plant_size
+        self.population = population
+        self.workers = workers
+
+        if plant is None:
+            plant = Plant()
+        self.params = plant_parameters(plant)
+        self.size = plant.size
+
+        self.rng = np.random.default_rng(seed)
+        self.generation = 0
+        self.fractions = self.rng.uniform(LOWER, UPPER, (population, len(RESOURCES)))
+        self.objectives = None
+        self._pool = None
+
+
+    def evaluate(self, fractions):
+        """ Evaluates policies, split in batches across the worker processes
+        :param fractions: 2D array (n_policies, 3) of the policies' fractions
+        Returns a 2D array (n_policies, 3) of (cost, periods, violation)
+        """
+        args = (self.max_time_period, self.max_plant_size, self.params, self.size)
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = mp.get_context().Pool(self.workers)
+            batches = np.array_split(fractions, self.workers)
+            results = self._pool.starmap(evaluate, [(b,) + args for b in batches])
+        else:
+            results = [evaluate(fractions, *args)]
+        return np.concatenate([np.column_stack(r) for r in results])
+
+
+    def _select(self, rank, distance):
+        """ Binary tournament selection on rank then crowding distance
+        Returns the indices of the parents
+        """
+        a, b = self.rng.integers(0, len(rank), (2, self.population))
+        better_a = (rank[a] < rank[b]) | ((rank[a] == rank[b]) & (distance[a] > distance[b]))
+        return np.where(better_a, a, b)
+
+
+    def _offspring(self, parents, eta_c=15, eta_m=20):
+        """ Creates new policies with simulated binary crossover and
+        polynomial mutation
+        :param parents: 2D array (n_policies, 3) of the parents' fractions
+        """
+        half = len(parents) // 2
+        p1, p2 = parents[:half], parents[half:2 * half]
+
+        u = self.rng.random(p1.shape)
+        beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta_c + 1)),
+                        (1 / (2 * (1 - u))) ** (1 / (eta_c + 1)))
+        children = np.concatenate([0.5 * ((1 + beta) * p1 + (1 - beta) * p2),
+                                   0.5 * ((1 - beta) * p1 + (1 + beta) * p2),
+                                   parents[2 * half:]])
+
+        mutate = self.rng.random(children.shape) < 1 / len(RESOURCES)
+        u = self.rng.random(children.shape)
+        delta = np.where(u < 0.5, (2 * u) ** (1 / (eta_m + 1)) - 1,
+                         1 - (2 * (1 - u)) ** (1 / (eta_m + 1)))
+        children = children + mutate * delta * (UPPER - LOWER)
+        return np.clip(children, LOWER, UPPER)
+
+
+    def step(self):
+        """ Runs a single generation: the offspring compete with their parents
+        for a place in the next generation
+        """
+        if self.objectives is None:
+            self.objectives = self.evaluate(self.fractions)
+
+        rank = non_dominated_sort([tuple(o) for o in self.objectives])
+        distance = crowding_distance(self.objectives[:, :2], rank)
+        children = self._offspring(self.fractions[self._select(rank, distance)])
+
+        fractions = np.concatenate([self.fractions, children])
+        objectives = np.concatenate([self.objectives, self.evaluate(children)])
+        rank = non_dominated_sort([tuple(o) for o in objectives])
+        distance = crowding_distance(objectives[:, :2], rank)
+
+        survivors = np.lexsort((-distance, rank))[:self.population]
+        self.fractions = fractions[survivors]
+        self.objectives = objectives[survivors]
+        self.generation += 1
+
+
+    def pareto_front(self):
+        """ Returns the policies reaching the plant's size that no other policy
+        dominates, sorted by periods, as a list of dictionaries containing
+        fractions: dictionary of the fractions of each resource's need
+        cost: total quantity of resources added
+        periods: time periods to reach the plant's size
+        """
+        if self.objectives is None:
+            self.objectives = self.evaluate(self.fractions)
+
+        rank = non_dominated_sort([tuple(o) for o in self.objectives])
+        front = {}
+        for i in np.flatnonzero((rank == 0) & (self.objectives[:, 2] == 0)):
+            cost, periods, _ = self.objectives[i]
+            key = (cost, periods)
+            if key not in front:
+                front[key] = {'fractions': dict(zip(RESOURCES, self.fractions[i].tolist())),
+                              'cost': float(cost), 'periods': int(periods)}
+        return sorted(front.values(), key=lambda p: p['periods'])
+
+
+    def save(self, path):
+        """ Saves the optimizer's progress
+        :param path: string containing the path of the checkpoint
+        """
+        tmp = path + '.tmp.npz'
+        np.savez(tmp, fractions=self.fractions,
+                 objectives=self.objectives if self.objectives is not None else np.empty(0),
+                 generation=self.generation,
+                 rng=json.dumps(self.rng.bit_generator.state),
+                 settings=[self.max_time_period, self.max_plant_size, self.population])
+        os.replace(tmp, path)
+
+
+    def load(self, path):
+        """ Resumes the optimizer's progress from a checkpoint
+        :param path: string containing the path of the checkpoint
+        """
+        with np.load(path) as data:
+            settings = data['settings'].tolist()
+            if settings != [self.max_time_period, self.max_plant_size, self.population]:
+                raise ValueError('Checkpoint %s was saved for other settings %s'%(path, settings))
+            self.fractions = data['fractions']
+            self.objectives = data['objectives'] if data['objectives'].size else None
+            self.generation = int(data['generation'])
+            self.rng.bit_generator.state = json.loads(str(data['rng']))
+
+
+    def run(self, generations, checkpoint=None, every=5):
+        """ Runs the optimization, resuming from the checkpoint if any
+        :param generations: integer containing the total number of generations
+        :param checkpoint: string containing the path of the checkpoint
+        :param every: integer containing the number of generations between checkpoints
+        Returns the pareto front (see pareto_front)
+        """
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self.load(checkpoint)
+
+        try:
+            while self.generation < generations:
+                self.step()
+                if checkpoint is not None and (
+                        self.generation % every == 0 or self.generation == generations):
+                    self.save(checkpoint)
+            return self.pareto_front()
+        finally:
+            self.close()
+
+
+    def close(self):
+        """ Stops the worker processes
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+def main(args):
+
+    try:
+        max_time_period = int(args['<max_time_periods>'])
+        max_plant_size = int(args['<max_plant_size>'])
+    except ValueError:
+        print('Re run script by entering integers for Max Time Period and Max Plant Size')
+        return 1
+
+    optimizer = Optimizer(max_time_period, max_plant_size,
+                          population=int(args['--population']),
+                          workers=int(args['--workers']),
+                          seed=int(args['--seed']))
+    front = optimizer.run(int(args['--generations']), args['--checkpoint'],
+                          int(args['--every']))
+
+    if not front:
+        print("No policy found reaching %d inches in %d time periods"%(
+                max_plant_size, max_time_period))
+        return 1
+
+    print("periods |     cost | water | light | nutrients (fractions of the needs)")
+    for policy in front:
+        print("%7d | %8d | %5.3f | %5.3f | %5.3f"%(
+                policy['periods'], policy['cost'], policy['fractions']['water'],
+                policy['fractions']['light'], policy['fractions']['nutrients']))
+
+
+if __name__ == "__main__":
+    args = docopt(__doc__)
+    main(args)
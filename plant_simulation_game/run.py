@@ -44,6 +44,18 @@ def main(args):
             print("- Decide how much you want to water the plant %s"%emoji.emojize(':droplet:'))
             print("- Decide how much light you want to provide to the plant %s"%emoji.emojize(':sun_with_face:'))
             print("- Decide how much nutrient pills you want to feed the plant %s"%emoji.emojize(':pill:'))
+            
+            # difficulty of the game's settings, if calibrated
+            if game.difficulty is not None:
+                print("\n")
+                if game.difficulty['difficulty'] == 'impossible':
+                    print("Be warned, this game can't be won! %s"%emoji.emojize(':skull:'))
+                else:
+                    print("This game is %s. To start with, the plant needs at least:"%(
+                            game.difficulty['difficulty']))
+                    print("- %d drops of water %s"%(game.difficulty['water'], emoji.emojize(':droplet:')))
+                    print("- %d units of light %s"%(game.difficulty['light'], emoji.emojize(':sun_with_face:')))
+                    print("- %d nutrient pills %s"%(game.difficulty['nutrients'], emoji.emojize(':pill:')))
             print("\n")
             # initialize
             c = Controller(game)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: hassoun
+Sensitivity analysis of a game's outcome to the plant's parameters
+The parameters are replaced by forward-mode dual numbers so that a single
+simulation yields the outcome and its derivatives with respect to every
+parameter at once
+"""
+
+from game import Game
+import numpy as np
+import copy
+
+# plant parameters the derivatives are computed against
+# (attribute name, key or index within the attribute if any)
+PARAMETERS = (
+        ('water_c_rate', None),
+        ('light_c_rate', None),
+        ('nutrients_c_rate', None),
+        ('water_g_rate', None),
+        ('light_g_rate', None),
+        ('nutrients_g_rate', None),
+        ('growth_coef', 'water'),
+        ('growth_coef', 'light'),
+        ('growth_coef', 'nutrients'),
+        ('water_range', 0),
+        ('water_range', 1),
+        ('light_range', 0),
+        ('light_range', 1),
+        ('nutrients_range', 0),
+        ('nutrients_range', 1))
+
+
+def parameter_name(attribute, key):
+    """ Returns the display name of a plant parameter, e.g. growth_coef[water]
+    """
+    if key is None:
+        return attribute
+    return '%s[%s]'%(attribute, key)
+
+
+class Dual:
+
+    def __init__(self, value, tangent):
+        """ This is a dual number constructor
+        :param value: float containing the value of the number
+        :param tangent: array containing the derivatives of the number with
+        respect to each of the seeded parameters
+        """
+        self.value = value
+        self.tangent = tangent
+
+
+    @staticmethod
+    def _split(other):
+        """ Returns the value and tangent of a dual number or a constant
+        """
+        if isinstance(other, Dual):
+            return other.value, other.tangent
+        return other, 0
+
+    def __add__(self, other):
+        value, tangent = Dual._split(other)
+        return Dual(self.value + value, self.tangent + tangent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        value, tangent = Dual._split(other)
+        return Dual(self.value - value, self.tangent - tangent)
+
+    def __rsub__(self, other):
+        value, tangent = Dual._split(other)
+        return Dual(value - self.value, tangent - self.tangent)
+
+    def __mul__(self, other):
+        value, tangent = Dual._split(other)
+        return Dual(self.value * value, self.tangent * value + self.value * tangent)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        value, tangent = Dual._split(other)
+        return Dual(self.value / value,
+                    (self.tangent * value - self.value * tangent) / (value * value))
+
+    def __rtruediv__(self, other):
+        value, tangent = Dual._split(other)
+        return Dual(value / self.value,
+                    (tangent * self.value - value * self.tangent) / (self.value * self.value))
+
+    def __neg__(self):
+        return Dual(-self.value, -self.tangent)
+
+    # comparisons only look at the values. The min/max clamps of the game are
+    # piecewise-linear, the derivative follows the branch that was selected
+    def __lt__(self, other):
+        return self.value < Dual._split(other)[0]
+
+    def __le__(self, other):
+        return self.value <= Dual._split(other)[0]
+
+    def __gt__(self, other):
+        return self.value > Dual._split(other)[0]
+
+    def __ge__(self, other):
+        return self.value >= Dual._split(other)[0]
+
+    def __float__(self):
+        return float(self.value)
+
+    def __repr__(self):
+        return 'Dual(%r, %r)'%(self.value, self.tangent)
+
+
+def seed_plant(plant):
+    """ Replaces each of the plant's parameters (see PARAMETERS) with a dual
+    number whose derivative with respect to that parameter is 1
+    :param plant: Plant object, modified in place
+    """
+    n = len(PARAMETERS)
+    plant.growth_coef = dict(plant.growth_coef)
+    plant.water_range = list(plant.water_range)
+    plant.light_range = list(plant.light_range)
+    plant.nutrients_range = list(plant.nutrients_range)
+
+    for i, (attribute, key) in enumerate(PARAMETERS):
+        tangent = np.zeros(n)
+        tangent[i] = 1
+        if key is None:
+            setattr(plant, attribute, Dual(getattr(plant, attribute), tangent))
+        else:
+            container = getattr(plant, attribute)
+            container[key] = Dual(container[key], tangent)
+
+
+def health_margin(plant, growth):
+    """ Computes how close the plant was to dying over the last time period.
+    It is the smallest distance, over water/light/nutrients, between what was
+    provided vs the need and the boundaries checked by Plant.get_health
+    :growth: plant growth over time period
+    Returns a dual number, negative when the plant died
+    """
+    previous_size = plant.size - growth
+    margins = []
+    for resource in ('water', 'light', 'nutrients'):
+        needed = previous_size * getattr(plant, resource + '_c_rate')
+        low, high = getattr(plant, resource + '_range')
+        delta = getattr(plant, 'delta_n_' + resource)
+        margins.append(delta - low * needed)
+        margins.append(high * needed - delta)
+    return min(margins)
+
+
+def gradient(number):
+    """ Returns a dictionary of the derivatives of a dual number with respect
+    to each of the plant's parameters
+    """
+    tangent = np.broadcast_to(number.tangent, len(PARAMETERS)) if isinstance(
+            number, Dual) else np.zeros(len(PARAMETERS))
+    return {parameter_name(attribute, key): float(d)
+            for (attribute, key), d in zip(PARAMETERS, tangent)}
+
+
+def analyze(max_time_period, max_plant_size, additions, plant=None):
+    """ Plays a game with the given additions and computes its outcome together
+    with the derivatives with respect to every plant parameter, in one pass
+    :param max_time_period: integer containing the number of "rounds"
+    (time periods) in a game
+    :param max_plant_size: plant's size to achieve before the end of the game
+    :param additions: list of (water, light, nutrients) added at each time period
+    :param plant: Plant object holding the parameters (defaults to a new Plant)
+    Returns a dictionary containing
+    status: game status at the end (-1 dead, 0 goal not achieved, 1 goal achieved)
+    periods: number of time periods played
+    size: final plant size (value, derivatives)
+    margin: final plant size minus max_plant_size (value, derivatives)
+    health_margin: smallest distance to the health boundaries over the
+    game (value, derivatives)
+    """
+    game = Game('Sensitivity', max_time_period, max_plant_size)
+    if plant is not None:
+        game.plant = copy.deepcopy(plant)
+    seed_plant(game.plant)
+
+    status = 0
+    periods = 0
+    margin = None
+
+    for water, light, nutrients in additions[:game.max_time_period]:
+        game.add_water(water)
+        game.add_light(light)
+        game.add_nutrients(nutrients)
+
+        previous_size = game.plant.size
+        status, _ = game.update()
+
+        period_margin = health_margin(game.plant, game.plant.size - previous_size)
+        if margin is None or period_margin < margin:
+            margin = period_margin
+
+        periods += 1
+        if status != 0:
+            break
+
+    size = game.plant.size
+    return {
+            'status': status,
+            'periods': periods,
+            'size': (float(size), gradient(size)),
+            'margin': (float(size - game.max_plant_size),
+                       gradient(size - game.max_plant_size)),
+            'health_margin': (float(margin) if margin is not None else 0.,
+                              gradient(margin))}
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: hassoun
+Terminal Object Class that renders the game's menus and status
+Menus and status are compiled once. On a terminal (TTY) the screen is laid
+out once and only what changed is redrawn using ANSI cursor addressing,
+otherwise the output is plain text
+"""
+
+import atexit
+import emoji
+import shutil
+import signal
+import sys
+import threading
+import unicodedata
+
+# ANSI escape sequences
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+CLEAR_LINE = '\x1b[2K'
+MOVE = '\x1b[%d;1H'
+SCROLL_REGION = '\x1b[%d;%dr'
+RESET_SCROLL_REGION = '\x1b[r'
+SAVE_CURSOR = '\x1b7'
+RESTORE_CURSOR = '\x1b8'
+
+# smallest number of lines left on screen for the messages
+MESSAGE_LINES = 4
+
+PARAMETERS = ('water', 'light', 'nutrients')
+
+# dictionary of units for each of the plant's parameters
+UNITS = {
+        'water': 'drops',
+        'light': 'units',
+        'nutrients': 'pills'}
+
+# dictionary of emojis for each of the plant's parameters
+EMOJIS = {
+        'water': ':droplet:',
+        'light': ':sun_with_face:',
+        'nutrients': ':pill:'}
+
+SEPARATOR = "=============================================================="
+
+
+def emojize(text):
+    """ Replaces the emoji names (and aliases) of a text with emojis
+    :param text: string containing emoji names, e.g. :seedling:
+    """
+    try:
+        return emoji.emojize(text, language='alias')
+    except TypeError:
+        # emoji < 1.7 only knows aliases through use_aliases
+        return emoji.emojize(text, use_aliases=True)
+
+
+def display_width(text):
+    """ Returns the number of columns a text takes on a terminal, emojis
+    (wide characters) take two
+    :param text: string displayed
+    """
+    width = 0
+    for c in text:
+        if c in '\ufe0f\u200d' or unicodedata.combining(c):
+            continue
+        width += 2 if unicodedata.east_asian_width(c) in 'WF' else 1
+    return width
+
+
+def clip(text, columns):
+    """ Cuts a text to the number of columns of a terminal
+    :param text: string displayed
+    :param columns: integer containing the terminal's width
+    """
+    if display_width(text) <= columns:
+        return text
+    width = 0
+    for i, c in enumerate(text):
+        width += display_width(c)
+        if width > columns:
+            return text[:i]
+    return text
+
+
+def compile_menus():
+    """ Compiles the menus displayed by the controller
+    Returns a dictionary of menus, each one being a tuple of lines. A '%d'
+    in a line stands for the game's current time period
+    """
+    menus = {
+            'start': (
+                "Please chose between the following options:",
+                emojize("%s  Start Game: Press 1"%':thumbsup:'),
+                emojize("%s  Quit Game: Press 2"%':thumbsdown:')),
+            'period': (
+                "", "",
+                SEPARATOR,
+                "What would you like to perform for the time period #%d",
+                "Please chose between the following options:",
+                emojize("--> View Game Status :seedling: : Press 1"),
+                emojize("--> Manage Water :droplet: : Press 2"),
+                emojize("--> Manage Light :sun_with_face: : Press 3"),
+                emojize("--> Manage Nutrients :pill: : Press 4"),
+                emojize("--> Nothing. Continue to the next round! :round_pushpin: : Press 5"),
+                emojize("--> Quit Game :thumbsdown: : Press 6"),
+                SEPARATOR)}
+
+    for parameter in PARAMETERS:
+        icon = emojize(EMOJIS[parameter])
+        menus[('manage', parameter)] = (
+                "", "",
+                SEPARATOR,
+                "You can either add or remove/reduce %s  %s (%s) for the time period #%%d"%(
+                        icon, parameter, UNITS[parameter]),
+                "Please chose between the following options:",
+                emojize("--> View Game Status :seedling: : Press 1"),
+                "--> Add %s %s : Press 2"%(parameter, emojize(':heavy_plus_sign:')),
+                "--> Remove/Reduce %s %s : Press 3"%(parameter, emojize(':heavy_minus_sign:')),
+                emojize("--> I'm good. Get back to previous menu :thumbs_up: : Press 4"),
+                SEPARATOR)
+        menus[('add', parameter)] = (
+                "", "",
+                "How much %s  %s %s do you want to add (enter 0 to cancel)?"%(
+                        icon, parameter, UNITS[parameter]))
+        menus[('remove', parameter)] = (
+                "", "",
+                "How many %s  %s %s do you want to remove/reduce (enter 0 to cancel)?"%(
+                        icon, parameter, UNITS[parameter]))
+    return menus
+
+
+def compile_screen_menus():
+    """ Compiles the compact menus displayed on screen: a header, a line of
+    options for the time period and a line of options for the parameter
+    managed. Switching between them only moves a marker
+    Returns the header and a dictionary of menus, each one being a tuple
+    (row within the menus, line)
+    """
+    header = "What would you like to perform for the time period #%d ?"
+    menus = {'period': (1, emojize(
+            "  1 :seedling: Status  2 :droplet: Water  3 :sun_with_face: Light  "
+            "4 :pill: Nutrients  5 :round_pushpin: Next  6 :thumbsdown: Quit"))}
+    for parameter in PARAMETERS:
+        menus[('manage', parameter)] = (2, "  %s %s (%s): 1 %s Status  2 %s Add  3 %s Remove  4 %s Back"%(
+                emojize(EMOJIS[parameter]), parameter.capitalize(), UNITS[parameter],
+                emojize(':seedling:'), emojize(':heavy_plus_sign:'),
+                emojize(':heavy_minus_sign:'), emojize(':thumbs_up:')))
+    return header, menus
+
+
+def compile_status():
+    """ Compiles the game status panel printed as plain text
+    Returns a tuple of lines, a '%.3f' in a line stands for a value
+    """
+    return (
+            "************************************************",
+            emojize("Current Plant Size :round_pushpin: : %.3f inches"),
+            emojize("Water level :droplet: : %.3f drops"),
+            emojize("Light level :sun_with_face: : %.3f units"),
+            emojize("Nutrients level :pill: : %.3f pills"),
+            "-----------------------------------------------",
+            emojize("Plant growth :straight_ruler: : %.3f inches"),
+            emojize("Water consumption :droplet: : %.3f drops"),
+            emojize("Light used :sun_with_face: : %.3f units"),
+            emojize("Nutrients consumption :pill: : %.3f pills"),
+            "-----------------------------------------------",
+            emojize("Plant water consumption vs need :droplet: : %.3f drops"),
+            emojize("Plant light provided vs need :sun_with_face: : %.3f units"),
+            emojize("Plant nutrients consumption vs need :pill: : %.3f pills"),
+            "************************************************")
+
+
+def compile_screen_status():
+    """ Compiles the compact game status panel displayed on screen: the plant's
+    size and growth then, for each parameter, its level, consumption and
+    consumption vs need
+    Returns a tuple of lines, each '%.3f' in a line stands for a value
+    """
+    lines = [emojize("  :round_pushpin: Size %10.3f inches    :straight_ruler: Growth %10.3f inches")]
+    for parameter in PARAMETERS:
+        lines.append("  %s %-9s level %%10.3f %-5s  used %%10.3f  vs need %%10.3f"%(
+                emojize(EMOJIS[parameter]), parameter.capitalize(), UNITS[parameter]))
+    lines.append(SEPARATOR)
+    return tuple(lines)
+
+
+class Terminal:
+
+    def __init__(self, game, stream=None):
+        """ This is a terminal constructor. It is called to create a new terminal
+        :param game: Game object whose status is displayed
+        :param stream: file the output is written to (defaults to sys.stdout)
+        """
+        self.game = game
+        self.stream = stream if stream is not None else sys.stdout
+
+        # menus and status panel compiled once
+        self.menus = compile_menus()
+        self.header, self.screen_menus = compile_screen_menus()
+        self.status_lines = compile_status()
+        self.screen_status = compile_screen_status()
+
+        # screen layout: status panel, header and menus, questions (one line
+        # menus), prompt, a separator then the messages which scroll below it
+        self.menu_row = len(self.screen_status) + 1
+        self.question_row = self.menu_row + 3
+        self.prompt_row = self.question_row + 1
+        self.message_row = self.prompt_row + 2
+
+        # smallest terminal the layout fits in, a period takes up to 4 digits
+        screen_lines = [self.header%9999, SEPARATOR]
+        screen_lines += [line for _, line in self.screen_menus.values()]
+        screen_lines += [self.menus[name][-1] for name in self.menus if name[0] in ('add', 'remove')]
+        screen_lines += [line.replace('%10.3f', ' ' * 10) for line in self.screen_status]
+        self.min_columns = max(display_width(line) for line in screen_lines)
+        self.min_lines = self.message_row + MESSAGE_LINES - 1
+
+        # cursor addressing is only used on terminals the layout fits in
+        self.tty = self.stream.isatty()
+        self.columns, self.lines = shutil.get_terminal_size()
+        self.started = False
+        self.screen = False
+
+        # lines currently displayed on screen
+        self.drawn_status = [None] * len(self.screen_status)
+        self.drawn_menu = [None] * 3
+        self.drawn_question = [None]
+        self.marker = None
+
+        # last round values, menus and prompt displayed
+        self.round_values = (0, 0, 0, 0)
+        self.current_menu = None
+        self.current_screen_menu = None
+        self.prompt = None
+
+        if self.tty:
+            # the resource levels are updated on screen as soon as they change
+            self.game.events.subscribe('resource_added', self.on_resource_changed)
+            self.game.events.subscribe('resource_removed', self.on_resource_changed)
+
+            # the screen is laid out again when the terminal is resized
+            if (hasattr(signal, 'SIGWINCH') and
+                    threading.current_thread() is threading.main_thread()):
+                signal.signal(signal.SIGWINCH, self.on_resize)
+            atexit.register(self.end_screen)
+
+
+    def write(self, text):
+        """ Writes text to the terminal's stream
+        """
+        self.stream.write(text)
+        self.stream.flush()
+
+
+    def fits(self):
+        """ Checks the terminal is large enough for the screen layout
+        """
+        self.columns, self.lines = shutil.get_terminal_size()
+        return self.columns >= self.min_columns and self.lines >= self.min_lines
+
+
+    def start_screen(self):
+        """ Lays out the screen when the game starts. Plain output (not a
+        terminal or a terminal too small) doesn't have a layout
+        """
+        self.started = True
+        if self.tty and not self.screen and self.fits():
+            self.draw()
+
+
+    def draw(self):
+        """ Clears the screen and draws the whole layout: the status panel,
+        the menus, the prompt and the messages scroll region
+        """
+        self.screen = True
+        self.drawn_status = [None] * len(self.screen_status)
+        self.drawn_menu = [None] * 3
+        self.drawn_question = [None]
+        self.marker = None
+
+        self.write(CLEAR_SCREEN + SCROLL_REGION%(self.message_row, self.lines) +
+                   MOVE%(self.message_row - 1) + SEPARATOR)
+        self.status(*self.round_values)
+        if self.current_screen_menu is not None:
+            self.menu(self.current_screen_menu)
+            if self.current_menu != self.current_screen_menu:
+                self.menu(self.current_menu)
+        if self.prompt is not None:
+            self.write(MOVE%self.prompt_row + self.prompt)
+        else:
+            self.write(MOVE%self.lines)
+
+
+    def end_screen(self):
+        """ Gives the whole terminal back, below what is displayed
+        """
+        if self.screen:
+            self.screen = False
+            self.write(RESET_SCROLL_REGION + MOVE%self.lines)
+
+
+    def on_resize(self, signum, frame):
+        """ Lays out the screen again when the terminal is resized, or falls
+        back to plain output if the layout doesn't fit anymore
+        """
+        if not self.started:
+            return
+        if self.fits():
+            self.draw()
+        elif self.screen:
+            self.screen = False
+            self.write(RESET_SCROLL_REGION + CLEAR_SCREEN + (self.prompt or ''))
+
+
+    def status(self, growth=0, water_consumed=0, light_consumed=0, nutrients_consumed=0):
+        """ Displays the plant and game current status. On screen,
+        only the lines that changed are redrawn
+        :growth: plant growth in inches
+        :water_consumed: water consumed in drops
+        :light_consumed: units of light used
+        :nutrients_consumed: nutrients consumed in pills
+        """
+        game = self.game
+        plant = game.plant
+        self.round_values = (growth, water_consumed, light_consumed, nutrients_consumed)
+
+        if not self.screen:
+            values = (None, plant.size, game.available_water, game.available_light,
+                      game.available_nutrients, None, growth, water_consumed,
+                      light_consumed, nutrients_consumed, None, plant.delta_n_water,
+                      plant.delta_n_light, plant.delta_n_nutrients, None)
+            lines = [line if value is None else line%value
+                     for line, value in zip(self.status_lines, values)]
+            self.write("\n\n" + "\n".join(lines) + "\n")
+            return
+
+        values = ((plant.size, growth),
+                  (game.available_water, water_consumed, plant.delta_n_water),
+                  (game.available_light, light_consumed, plant.delta_n_light),
+                  (game.available_nutrients, nutrients_consumed, plant.delta_n_nutrients),
+                  ())
+        lines = [line%value if value else line
+                 for line, value in zip(self.screen_status, values)]
+
+        changes = self.diff(self.drawn_status, lines, 1)
+        if changes:
+            # save and restore the cursor so that the prompt is left untouched
+            self.write(SAVE_CURSOR + changes + RESTORE_CURSOR)
+
+
+    def diff(self, drawn, lines, row):
+        """ Compares lines to the ones drawn on screen
+        :param drawn: list of the lines drawn, updated in place
+        :param lines: list of the lines to draw
+        :param row: integer containing the screen row of the first line
+        Returns the escape sequences redrawing the lines that changed
+        """
+        changes = []
+        for i, line in enumerate(lines):
+            if line != drawn[i]:
+                drawn[i] = line
+                changes.append(MOVE%(row + i) + CLEAR_LINE + clip(line, self.columns))
+        return ''.join(changes)
+
+
+    def on_resource_changed(self, resource, value, level):
+        """ Redraws the resource levels when a resource is added or removed
+        """
+        if self.screen:
+            self.status(*self.round_values)
+
+
+    def menu(self, name):
+        """ Displays a menu. On screen, the compact menus are drawn once and
+        marked when active, questions (one line menus) are displayed above the
+        prompt, only what changed is redrawn
+        :param name: key of the menu (see compile_menus)
+        """
+        period = self.game.time_period
+        self.current_menu = name
+        if name in self.screen_menus:
+            self.current_screen_menu = name
+
+        if not self.screen:
+            self.write("\n".join(line%period if '%d' in line else line
+                                 for line in self.menus[name]) + "\n")
+            return
+
+        if name in self.screen_menus:
+            row, line = self.screen_menus[name]
+            lines = list(self.drawn_menu)
+            lines[0] = self.header%period
+            lines[1] = self.screen_menus['period'][1]
+            lines[row] = line
+            if lines[2] is None:
+                lines[2] = ''
+            question = ''
+        else:
+            lines, row = self.drawn_menu, self.marker
+            question = self.menus[name][-1]
+
+        redrawn = row is not None and lines[row] != self.drawn_menu[row]
+        changes = self.diff(self.drawn_menu, lines, self.menu_row)
+        changes += self.diff(self.drawn_question, [question], self.question_row)
+
+        # the marker is drawn in the first column of the active menu
+        if row != self.marker:
+            if self.marker is not None:
+                changes += MOVE%(self.menu_row + self.marker) + ' '
+            self.marker = row
+            redrawn = True
+        if redrawn:
+            changes += MOVE%(self.menu_row + row) + '>'
+        self.write(changes)
+
+
+    def ask(self, prompt="Enter choice:"):
+        """ Prompts the user for a choice. On screen, the prompt has its own
+        line and what is printed after the choice scrolls in the messages region
+        Returns the user's input
+        """
+        if not self.screen:
+            return input(prompt)
+
+        self.prompt = prompt
+        self.write(MOVE%self.prompt_row + CLEAR_LINE)
+        try:
+            choice = input(prompt)
+        finally:
+            self.prompt = None
+        if self.screen:
+            self.write(MOVE%self.lines)
+        return choice